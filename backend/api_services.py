@@ -8,6 +8,7 @@ Reduces main.py complexity and improves separation of concerns.
 Author: StreamClip AI Team
 """
 
+import asyncio
 import os
 import uuid
 import json
@@ -16,11 +17,18 @@ import logging
 import subprocess
 import re
 import sys
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 import shutil
 
+import aiofiles.os
+from models import JobStatus
+# Imported at module scope: yt-dlp pulls in hundreds of extractor modules
+# (~500ms cold), so pay that once at startup instead of on the first download
+import yt_dlp
+
 logger = logging.getLogger(__name__)
 
 class JobManager:
@@ -30,6 +38,11 @@ class JobManager:
         self.jobs_file = jobs_file
         self.cleanup_hours = cleanup_hours
         self.jobs: Dict[str, dict] = {}
+        # Maps clip basename -> job_id for O(1) download authorization
+        self.clip_index: Dict[str, str] = {}
+        # Count of jobs currently in "processing", maintained on transitions
+        # so status endpoints don't scan the whole jobs dict
+        self._active_count = 0
         self.load_jobs()
     
     def save_jobs(self):
@@ -48,14 +61,33 @@ class JobManager:
                 
                 serializable_jobs[job_id] = serializable_job
             
-            with open(self.jobs_file, 'w') as f:
+            # Write to a temp file and atomically swap it in so a crash
+            # mid-write can't leave a corrupt half-written jobs file
+            tmp_path = f"{self.jobs_file}.tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(serializable_jobs, f, indent=2)
-            
-            logger.debug(f"Saved {len(self.jobs)} jobs to {self.jobs_file}")
+            os.replace(tmp_path, self.jobs_file)
+
+            logger.debug("Saved %s jobs to %s", len(self.jobs), self.jobs_file)
             
         except Exception as e:
-            logger.error(f"Failed to save jobs: {e}")
+            logger.error("Failed to save jobs: %s", e)
     
+    def storage_probe(self) -> bool:
+        """
+        Check that job storage is writable without rewriting all job state
+
+        Returns:
+            True if a one-byte sentinel write succeeds
+        """
+        try:
+            fd = os.open(f"{self.jobs_file}.probe", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.write(fd, b".")
+            os.close(fd)
+            return True
+        except OSError:
+            return False
+
     def load_jobs(self):
         """Load jobs from persistent storage"""
         try:
@@ -69,14 +101,28 @@ class JobManager:
                         job_data["created_at"] = datetime.fromisoformat(job_data["created_at"])
                     if isinstance(job_data.get("completed_at"), str):
                         job_data["completed_at"] = datetime.fromisoformat(job_data["completed_at"])
+                    # Normalize stored ints (and legacy strings) to JobStatus
+                    try:
+                        job_data["status"] = JobStatus.from_value(job_data.get("status", JobStatus.QUEUED))
+                    except (KeyError, ValueError):
+                        job_data["status"] = JobStatus.FAILED
                 
                 self.jobs = loaded_jobs
-                logger.info(f"Loaded {len(self.jobs)} jobs from storage")
+
+                # Rebuild the clip index and active counter in a single pass
+                self.clip_index = {}
+                self._active_count = 0
+                for job_id, job_data in self.jobs.items():
+                    self._index_clips(job_id, job_data.get("clips", []))
+                    if job_data.get("status") == JobStatus.PROCESSING:
+                        self._active_count += 1
+
+                logger.info("Loaded %s jobs from storage", len(self.jobs))
             else:
                 logger.info("No existing jobs file found, starting fresh")
                 
         except Exception as e:
-            logger.error(f"Failed to load jobs: {e}")
+            logger.error("Failed to load jobs: %s", e)
             self.jobs = {}
     
     def create_job(self, filename: str, **kwargs) -> str:
@@ -90,8 +136,9 @@ class JobManager:
         Returns:
             Job ID
         """
-        job_id = str(uuid.uuid4())
-        
+        # One uuid4 (one urandom read) per job; hex form is globally unique on its own
+        job_id = uuid.uuid4().hex
+
         # Create safe filename for storage
         safe_filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.')).rstrip()
         
@@ -99,7 +146,7 @@ class JobManager:
             "id": job_id,
             "filename": filename,
             "safe_filename": safe_filename,
-            "status": "queued",
+            "status": JobStatus.QUEUED,
             "progress": 0,
             "current_phase": "Queued for processing...",
             "created_at": datetime.now(),
@@ -114,26 +161,98 @@ class JobManager:
         self.jobs[job_id] = job_data
         self.save_jobs()
         
-        logger.info(f"Created job {job_id}: {filename}")
+        logger.info("Created job %s: %s", job_id, filename)
         return job_id
     
     def get_job(self, job_id: str) -> Optional[dict]:
         """Get job by ID"""
         return self.jobs.get(job_id)
-    
+
+    def active_count(self) -> int:
+        """Number of jobs currently processing (O(1))"""
+        return self._active_count
+
+    def total_count(self) -> int:
+        """Total number of tracked jobs (O(1))"""
+        return len(self.jobs)
+
     def update_job(self, job_id: str, **updates):
         """Update job data"""
         if job_id in self.jobs:
+            if "status" in updates:
+                updates["status"] = JobStatus.from_value(updates["status"])
+                old_status = self.jobs[job_id].get("status")
+                new_status = updates["status"]
+                if old_status != new_status:
+                    self._active_count += ((new_status == JobStatus.PROCESSING)
+                                           - (old_status == JobStatus.PROCESSING))
             self.jobs[job_id].update(updates)
+            if "clips" in updates:
+                self._index_clips(job_id, updates["clips"])
+                # Precompute the download names so response paths don't re-basename
+                self.jobs[job_id]["clip_basenames"] = [
+                    os.path.basename(clip) for clip in updates["clips"]
+                ]
             self.save_jobs()
         else:
-            logger.warning(f"Attempted to update non-existent job: {job_id}")
+            logger.warning("Attempted to update non-existent job: %s", job_id)
+
+    def _index_clips(self, job_id: str, clips: List[str]):
+        """Index clip basenames for O(1) download lookups"""
+        for clip in clips:
+            self.clip_index[os.path.basename(clip)] = job_id
+
+    def _unindex_job(self, job_id: str):
+        """Remove a job's clips from the clip index"""
+        self.clip_index = {
+            basename: owner for basename, owner in self.clip_index.items()
+            if owner != job_id
+        }
+
+    def get_clip_job(self, filename: str) -> Optional[str]:
+        """Look up the job that owns a clip basename (O(1))"""
+        return self.clip_index.get(filename)
     
-    def get_all_jobs(self) -> List[dict]:
-        """Get all jobs sorted by creation time (newest first)"""
-        all_jobs = list(self.jobs.values())
+    def __len__(self) -> int:
+        """Number of tracked jobs without materializing a list"""
+        return len(self.jobs)
+
+    def iter_jobs(self):
+        """Iterate over jobs without copying them into a list"""
+        return iter(self.jobs.values())
+
+    def count_by_status(self, status) -> int:
+        """Count jobs in a given status (O(1) for 'processing')"""
+        status = JobStatus.from_value(status)
+        if status == JobStatus.PROCESSING:
+            return self._active_count
+        return sum(1 for job in self.jobs.values() if job.get("status") == status)
+
+    def get_all_jobs(self, status: Optional[str] = None,
+                     limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        """
+        Get jobs sorted by creation time (newest first)
+
+        Args:
+            status: Only include jobs with this status
+            limit: Maximum number of jobs to return
+            offset: Number of jobs to skip from the newest
+
+        Returns:
+            List of job dictionaries
+        """
+        if status is not None:
+            try:
+                status = JobStatus.from_value(status)
+            except (KeyError, ValueError):
+                return []
+            all_jobs = [job for job in self.jobs.values() if job.get("status") == status]
+        else:
+            all_jobs = list(self.jobs.values())
         all_jobs.sort(key=lambda x: x.get("created_at", datetime.min), reverse=True)
-        return all_jobs
+        if limit is not None:
+            return all_jobs[offset:offset + limit]
+        return all_jobs[offset:] if offset else all_jobs
     
     def cleanup_old_jobs(self):
         """Clean up jobs older than cleanup_hours"""
@@ -145,18 +264,19 @@ class JobManager:
                 created_at = job_data.get("created_at")
                 if isinstance(created_at, datetime) and created_at < cutoff_time:
                     # Only remove completed or failed jobs
-                    if job_data.get("status") in ["completed", "failed"]:
+                    if job_data.get("status") in (JobStatus.COMPLETED, JobStatus.FAILED):
                         jobs_to_remove.append(job_id)
             
             for job_id in jobs_to_remove:
                 del self.jobs[job_id]
-                logger.info(f"Cleaned up old job: {job_id}")
+                self._unindex_job(job_id)
+                logger.info("Cleaned up old job: %s", job_id)
             
             if jobs_to_remove:
                 self.save_jobs()
                 
         except Exception as e:
-            logger.error(f"Error during job cleanup: {e}")
+            logger.error("Error during job cleanup: %s", e)
 
 class FileValidator:
     """Validates uploaded files and system constraints"""
@@ -164,7 +284,11 @@ class FileValidator:
     def __init__(self, max_file_size: int = 5 * 1024 * 1024 * 1024, 
                  allowed_extensions: set = None):
         self.max_file_size = max_file_size
-        self.allowed_extensions = allowed_extensions or {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv'}
+        self.allowed_extensions = frozenset(
+            allowed_extensions or {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv'}
+        )
+        # Tuple form lets str.endswith check all suffixes in a single C call
+        self.allowed_suffixes = tuple(sorted(self.allowed_extensions))
     
     def validate_file(self, file) -> Optional[str]:
         """
@@ -179,10 +303,9 @@ class FileValidator:
         if not hasattr(file, 'filename') or not file.filename:
             return "No filename provided"
         
-        # Check file extension
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in self.allowed_extensions:
-            return f"Unsupported file type. Allowed: {', '.join(self.allowed_extensions)}"
+        # Check file extension in one C-level endswith call
+        if not file.filename.lower().endswith(self.allowed_suffixes):
+            return f"Unsupported file type. Allowed: {', '.join(self.allowed_suffixes)}"
         
         # Check file size (if provided)
         if hasattr(file, 'size') and file.size and file.size > self.max_file_size:
@@ -198,43 +321,62 @@ class FileValidator:
         except:
             return False
 
+# Compiled once at import time: the Twitch VOD URL formats we accept,
+# plus a bare-number fallback (VOD IDs are typically 8+ digits)
+_VOD_ID_PATTERNS = (
+    re.compile(r'twitch\.tv/videos/(\d+)'),
+    re.compile(r'twitch\.tv/\w+/v/(\d+)'),
+    re.compile(r'twitch\.tv/\w+/video/(\d+)'),
+)
+_VOD_ID_FALLBACK = re.compile(r'(\d{8,})')
+
 class TwitchVODService:
     """Handles Twitch VOD download and processing"""
     
     def __init__(self, output_dir: str = "temp"):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
-    
-    def extract_vod_id(self, url: str) -> str:
+
+        # One YoutubeDL per service: the options never change, so reuse the
+        # instance (and its extractor/cookie setup) across downloads
+        self._ydl = None
+        self._ydl_lock = threading.Lock()
+
+    def _get_downloader(self):
+        """Lazily create the shared YoutubeDL instance"""
+        if self._ydl is None:
+            self._ydl = yt_dlp.YoutubeDL({
+                'format': 'best[height<=1080]',  # Best quality up to 1080p
+                'outtmpl': os.path.join(self.output_dir, 'twitch_vod_%(id)s.%(ext)s'),
+                'nocheckcertificate': True,  # Handle SSL issues
+            })
+        return self._ydl
+
+    @staticmethod
+    def extract_vod_id(url: str) -> str:
         """
         Extract Twitch VOD ID from various URL formats
-        
+
         Args:
             url: Twitch VOD URL
-            
+
         Returns:
             VOD ID string
-            
+
         Raises:
             ValueError: If VOD ID cannot be extracted
         """
-        # Handle different Twitch URL formats
-        patterns = [
-            r'twitch\.tv/videos/(\d+)',
-            r'twitch\.tv/\w+/v/(\d+)',
-            r'twitch\.tv/\w+/video/(\d+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        # Handle different Twitch URL formats (patterns compiled at import)
+        for pattern in _VOD_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
-        
+
         # If no pattern matches, try to extract just the numeric part
-        numeric_match = re.search(r'(\d{8,})', url)  # VOD IDs are typically 8+ digits
+        numeric_match = _VOD_ID_FALLBACK.search(url)
         if numeric_match:
             return numeric_match.group(1)
-        
+
         raise ValueError(f"Could not extract VOD ID from URL: {url}")
     
     def download_vod(self, url: str) -> dict:
@@ -248,26 +390,18 @@ class TwitchVODService:
             Dictionary with download results
         """
         try:
-            import yt_dlp
-            
             vod_id = self.extract_vod_id(url)
-            output_filename = f"twitch_vod_{vod_id}.%(ext)s"
-            output_path = os.path.join(self.output_dir, output_filename)
-            
-            # Configure yt-dlp options
-            ydl_opts = {
-                'format': 'best[height<=1080]',  # Best quality up to 1080p
-                'outtmpl': output_path,
-                'nocheckcertificate': True,  # Handle SSL issues
-            }
-            
-            logger.info(f"Starting download of Twitch VOD: {url}")
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+
+            logger.info("Starting download of Twitch VOD: %s", url)
+
+            # YoutubeDL is not thread-safe, so serialize downloads per instance
+            with self._ydl_lock:
+                ydl = self._get_downloader()
+
                 # Get info first
                 info = ydl.extract_info(url, download=False)
                 expected_filename = ydl.prepare_filename(info)
-                
+
                 # Download the video
                 ydl.download([url])
             
@@ -277,7 +411,7 @@ class TwitchVODService:
             # Get file info
             file_size = os.path.getsize(expected_filename)
             
-            logger.info(f"Successfully downloaded VOD: {expected_filename} ({file_size / 1024 / 1024:.2f}MB)")
+            logger.info("Successfully downloaded VOD: %s (%.2fMB)", expected_filename, file_size / 1024 / 1024)
             
             return {
                 "success": True,
@@ -296,44 +430,59 @@ class TwitchVODService:
         try:
             if os.path.exists(file_path):
                 os.remove(file_path)
-                logger.info(f"Cleaned up VOD file: {file_path}")
+                logger.info("Cleaned up VOD file: %s", file_path)
+        except Exception as e:
+            logger.warning("Could not clean up VOD file %s: %s", file_path, e)
+
+    async def cleanup_vod_file_async(self, file_path: str):
+        """Clean up downloaded VOD file without blocking the event loop"""
+        try:
+            if await aiofiles.os.path.exists(file_path):
+                await aiofiles.os.remove(file_path)
+                logger.info("Cleaned up VOD file: %s", file_path)
         except Exception as e:
-            logger.warning(f"Could not clean up VOD file {file_path}: {e}")
+            logger.warning("Could not clean up VOD file %s: %s", file_path, e)
 
 class BackgroundTaskService:
     """Manages background processing tasks"""
     
-    def __init__(self, job_manager: JobManager, processor, cleanup_util):
+    def __init__(self, job_manager: JobManager, processor, cleanup_util,
+                 twitch_service: Optional[TwitchVODService] = None):
         self.job_manager = job_manager
         self.processor = processor
         self.cleanup_util = cleanup_util
+        # Shared so VOD downloads reuse one YoutubeDL across jobs
+        self.twitch_service = twitch_service or TwitchVODService()
     
     async def process_video_background(self, job_id: str, video_path: str, settings):
         """Background task for video processing"""
         try:
-            logger.info(f"Starting background processing for job {job_id}")
+            logger.info("Starting background processing for job %s", job_id)
             
             # Update job status
             self.job_manager.update_job(
                 job_id,
-                status="processing",
+                status=JobStatus.PROCESSING,
                 progress=10,
                 current_phase="Analyzing video..."
             )
             
-            # Process the video
-            result = self.processor.process_video(
+            # Process the video in a worker thread: the heavy lifting happens
+            # in ffmpeg subprocesses and GIL-releasing numpy/librosa kernels,
+            # so this keeps the event loop serving requests during the job
+            result = await asyncio.to_thread(
+                self.processor.process_video,
                 video_path,
                 audio_threshold=settings.audio_threshold,
                 clip_duration=settings.clip_duration,
                 max_clips=settings.max_clips
             )
-            
+
             if result.get("success"):
                 # Success
                 self.job_manager.update_job(
                     job_id,
-                    status="completed",
+                    status=JobStatus.COMPLETED,
                     progress=100,
                     current_phase="Processing complete!",
                     completed_at=datetime.now(),
@@ -343,29 +492,29 @@ class BackgroundTaskService:
                     stats=result.get("stats")
                 )
                 
-                logger.info(f"Job {job_id} completed successfully with {len(result.get('clips', []))} clips")
+                logger.info("Job %s completed successfully with %s clips", job_id, len(result.get('clips', [])))
             else:
                 # Processing failed
                 error_msg = result.get("error", "Unknown processing error")
                 self.job_manager.update_job(
                     job_id,
-                    status="failed",
+                    status=JobStatus.FAILED,
                     error=error_msg,
                     completed_at=datetime.now()
                 )
                 
-                logger.error(f"Job {job_id} failed: {error_msg}")
+                logger.error("Job %s failed: %s", job_id, error_msg)
                 
         except Exception as e:
             # Unexpected error
             self.job_manager.update_job(
                 job_id,
-                status="failed",
+                status=JobStatus.FAILED,
                 error=f"Processing error: {str(e)}",
                 completed_at=datetime.now()
             )
             
-            logger.error(f"Unexpected error in job {job_id}: {e}")
+            logger.error("Unexpected error in job %s: %s", job_id, e)
             
         finally:
             # Clean up temporary files
@@ -373,29 +522,31 @@ class BackgroundTaskService:
                 if hasattr(self.processor, 'cleanup_temp_files'):
                     self.processor.cleanup_temp_files()
             except Exception as e:
-                logger.warning(f"Error during cleanup: {e}")
+                logger.warning("Error during cleanup: %s", e)
     
     async def process_twitch_vod_background(self, job_id: str, twitch_url: str, settings):
         """Background task for Twitch VOD processing"""
-        twitch_service = TwitchVODService()
-        
+        twitch_service = self.twitch_service
+
         try:
-            logger.info(f"Starting Twitch VOD processing for job {job_id}: {twitch_url}")
+            logger.info("Starting Twitch VOD processing for job %s: %s", job_id, twitch_url)
             
             # Phase 1: Download VOD
             self.job_manager.update_job(
                 job_id,
-                status="processing",
+                status=JobStatus.PROCESSING,
                 progress=5,
                 current_phase="📥 Downloading Twitch VOD..."
             )
             
-            download_result = twitch_service.download_vod(twitch_url)
+            # download_vod is synchronous (yt-dlp); run it in a thread so the
+            # event loop keeps serving requests during the download
+            download_result = await asyncio.to_thread(twitch_service.download_vod, twitch_url)
             
             if not download_result["success"]:
                 self.job_manager.update_job(
                     job_id,
-                    status="failed",
+                    status=JobStatus.FAILED,
                     error=download_result["error"],
                     completed_at=datetime.now()
                 )
@@ -413,8 +564,9 @@ class BackgroundTaskService:
                 file_size=download_result["file_size"]
             )
             
-            # Phase 2: Process the downloaded video
-            result = self.processor.process_video(
+            # Phase 2: Process the downloaded video off the event loop
+            result = await asyncio.to_thread(
+                self.processor.process_video,
                 video_path,
                 audio_threshold=settings.audio_threshold,
                 clip_duration=settings.clip_duration,
@@ -425,7 +577,7 @@ class BackgroundTaskService:
                 # Success
                 self.job_manager.update_job(
                     job_id,
-                    status="completed",
+                    status=JobStatus.COMPLETED,
                     progress=100,
                     current_phase="🎉 Processing complete!",
                     completed_at=datetime.now(),
@@ -435,35 +587,35 @@ class BackgroundTaskService:
                     stats=result.get("stats")
                 )
                 
-                logger.info(f"Twitch VOD job {job_id} completed with {len(result.get('clips', []))} clips")
+                logger.info("Twitch VOD job %s completed with %s clips", job_id, len(result.get('clips', [])))
             else:
                 # Processing failed
                 self.job_manager.update_job(
                     job_id,
-                    status="failed",
+                    status=JobStatus.FAILED,
                     error=result.get("error", "Unknown processing error"),
                     completed_at=datetime.now()
                 )
                 
-                logger.error(f"Twitch VOD job {job_id} failed: {result.get('error')}")
+                logger.error("Twitch VOD job %s failed: %s", job_id, result.get('error'))
             
             # Clean up downloaded VOD file
-            twitch_service.cleanup_vod_file(video_path)
+            await twitch_service.cleanup_vod_file_async(video_path)
             
         except Exception as e:
             # Unexpected error
             self.job_manager.update_job(
                 job_id,
-                status="failed",
+                status=JobStatus.FAILED,
                 error=f"Processing error: {str(e)}",
                 completed_at=datetime.now()
             )
             
-            logger.error(f"Unexpected error in Twitch VOD job {job_id}: {e}")
+            logger.error("Unexpected error in Twitch VOD job %s: %s", job_id, e)
             
             # Try to clean up VOD file
             try:
                 if 'video_path' in locals():
-                    twitch_service.cleanup_vod_file(video_path)
+                    await twitch_service.cleanup_vod_file_async(video_path)
             except:
                 pass 
\ No newline at end of file
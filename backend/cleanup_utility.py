@@ -27,11 +27,13 @@ class CleanupUtility:
         self.temp_dir = "temp"
         self.clips_dir = "clips"
         self.uploads_dir = "uploads"
-        
+        self.cache_dir = "cache"
+
         # Cleanup thresholds
         self.temp_file_max_age_hours = 2     # Remove temp files older than 2 hours
         self.clips_max_age_days = 7          # Remove clips older than 7 days
         self.uploads_max_age_days = 3        # Remove uploads older than 3 days
+        self.cache_max_age_hours = 24        # Matches the performance cache TTL
         self.max_files_per_dir = 100         # Maximum files per directory
         
         # File patterns to clean
@@ -75,10 +77,10 @@ class CleanupUtility:
                             os.remove(file_path)
                             stats["removed"] += 1
                             stats["size_freed_mb"] += file_size / (1024 * 1024)
-                            logger.debug(f"Removed temp file: {os.path.basename(file_path)}")
+                            logger.debug("Removed temp file: %s", os.path.basename(file_path))
                     except Exception as e:
                         stats["errors"] += 1
-                        logger.warning(f"Could not remove temp file {file_path}: {e}")
+                        logger.warning("Could not remove temp file %s: %s", file_path, e)
             
             # Clean any other temp files in temp directory
             for filename in os.listdir(self.temp_dir):
@@ -90,18 +92,18 @@ class CleanupUtility:
                             os.remove(file_path)
                             stats["removed"] += 1
                             stats["size_freed_mb"] += file_size / (1024 * 1024)
-                            logger.debug(f"Removed temp file: {filename}")
+                            logger.debug("Removed temp file: %s", filename)
                     except Exception as e:
                         stats["errors"] += 1
-                        logger.warning(f"Could not remove temp file {file_path}: {e}")
+                        logger.warning("Could not remove temp file %s: %s", file_path, e)
             
             if stats["removed"] > 0:
-                logger.info(f"🧹 Cleaned up {stats['removed']} temp files, freed {stats['size_freed_mb']:.1f}MB")
+                logger.info("🧹 Cleaned up %s temp files, freed %.1fMB", stats['removed'], stats['size_freed_mb'])
             
             return stats
             
         except Exception as e:
-            logger.error(f"Error during temp file cleanup: {e}")
+            logger.error("Error during temp file cleanup: %s", e)
             stats["errors"] += 1
             return stats
     
@@ -133,18 +135,18 @@ class CleanupUtility:
                             os.remove(file_path)
                             stats["removed"] += 1
                             stats["size_freed_mb"] += file_size / (1024 * 1024)
-                            logger.debug(f"Removed old clip: {filename}")
+                            logger.debug("Removed old clip: %s", filename)
                     except Exception as e:
                         stats["errors"] += 1
-                        logger.warning(f"Could not remove old clip {file_path}: {e}")
+                        logger.warning("Could not remove old clip %s: %s", file_path, e)
             
             if stats["removed"] > 0:
-                logger.info(f"🧹 Cleaned up {stats['removed']} old clips, freed {stats['size_freed_mb']:.1f}MB")
+                logger.info("🧹 Cleaned up %s old clips, freed %.1fMB", stats['removed'], stats['size_freed_mb'])
             
             return stats
             
         except Exception as e:
-            logger.error(f"Error during clip cleanup: {e}")
+            logger.error("Error during clip cleanup: %s", e)
             stats["errors"] += 1
             return stats
     
@@ -176,21 +178,68 @@ class CleanupUtility:
                             os.remove(file_path)
                             stats["removed"] += 1
                             stats["size_freed_mb"] += file_size / (1024 * 1024)
-                            logger.debug(f"Removed old upload: {filename}")
+                            logger.debug("Removed old upload: %s", filename)
                     except Exception as e:
                         stats["errors"] += 1
-                        logger.warning(f"Could not remove old upload {file_path}: {e}")
+                        logger.warning("Could not remove old upload %s: %s", file_path, e)
             
             if stats["removed"] > 0:
-                logger.info(f"🧹 Cleaned up {stats['removed']} old uploads, freed {stats['size_freed_mb']:.1f}MB")
+                logger.info("🧹 Cleaned up %s old uploads, freed %.1fMB", stats['removed'], stats['size_freed_mb'])
             
             return stats
             
         except Exception as e:
-            logger.error(f"Error during upload cleanup: {e}")
+            logger.error("Error during upload cleanup: %s", e)
             stats["errors"] += 1
             return stats
     
+    def cleanup_cache_files(self, max_age_hours: int = None) -> Dict[str, int]:
+        """
+        Clean up expired persisted cache entries
+
+        The performance cache pickles results into cache/ but only expires
+        them lazily on access, so sweep anything past the TTL here.
+
+        Args:
+            max_age_hours: Maximum age in hours (uses default if None)
+
+        Returns:
+            Dictionary with cleanup statistics
+        """
+        stats = {"removed": 0, "errors": 0, "size_freed_mb": 0}
+
+        try:
+            if not os.path.exists(self.cache_dir):
+                return stats
+
+            max_age = max_age_hours or self.cache_max_age_hours
+            cutoff_time = time.time() - (max_age * 3600)
+
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.pkl'):
+                    file_path = os.path.join(self.cache_dir, filename)
+                    try:
+                        if os.path.getmtime(file_path) < cutoff_time:
+                            file_size = os.path.getsize(file_path)
+                            os.remove(file_path)
+                            stats["removed"] += 1
+                            stats["size_freed_mb"] += file_size / (1024 * 1024)
+                            logger.debug("Removed expired cache entry: %s", filename)
+                    except Exception as e:
+                        stats["errors"] += 1
+                        logger.warning("Could not remove cache entry %s: %s", file_path, e)
+
+            if stats["removed"] > 0:
+                logger.info("🧹 Cleaned up %s expired cache entries, freed %.1fMB",
+                            stats['removed'], stats['size_freed_mb'])
+
+            return stats
+
+        except Exception as e:
+            logger.error("Error during cache cleanup: %s", e)
+            stats["errors"] += 1
+            return stats
+
     def organize_clips(self) -> Dict[str, int]:
         """
         Organize clips by date and type
@@ -221,18 +270,18 @@ class CleanupUtility:
                                 if not os.path.exists(target_path):
                                     shutil.move(file_path, target_path)
                                     stats["organized"] += 1
-                                    logger.debug(f"Organized clip: {filename}")
+                                    logger.debug("Organized clip: %s", filename)
                             except Exception as e:
                                 stats["errors"] += 1
-                                logger.warning(f"Could not organize clip {filename}: {e}")
+                                logger.warning("Could not organize clip %s: %s", filename, e)
             
             if stats["organized"] > 0:
-                logger.info(f"📁 Organized {stats['organized']} clips")
+                logger.info("📁 Organized %s clips", stats['organized'])
             
             return stats
             
         except Exception as e:
-            logger.error(f"Error during clip organization: {e}")
+            logger.error("Error during clip organization: %s", e)
             stats["errors"] += 1
             return stats
     
@@ -253,11 +302,16 @@ class CleanupUtility:
         
         for dir_path, dir_name in directories:
             if os.path.exists(dir_path):
-                file_count = len([f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, f))])
-                total_size = sum(os.path.getsize(os.path.join(dir_path, f)) 
-                               for f in os.listdir(dir_path) 
-                               if os.path.isfile(os.path.join(dir_path, f)))
-                
+                # Single scandir pass: DirEntry reuses the directory fd and
+                # cached stat data instead of a path lookup per file
+                file_count = 0
+                total_size = 0
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            file_count += 1
+                            total_size += entry.stat(follow_symlinks=False).st_size
+
                 status[dir_name] = {
                     "file_count": file_count,
                     "size_mb": total_size / (1024 * 1024),
@@ -266,9 +320,9 @@ class CleanupUtility:
                 }
                 
                 if status[dir_name]["over_limit"]:
-                    logger.warning(f"⚠️ {dir_name} directory over file limit: {file_count} files")
+                    logger.warning("⚠️ %s directory over file limit: %s files", dir_name, file_count)
                 elif status[dir_name]["approaching_limit"]:
-                    logger.info(f"📊 {dir_name} directory approaching limit: {file_count} files")
+                    logger.info("📊 %s directory approaching limit: %s files", dir_name, file_count)
             else:
                 status[dir_name] = {"file_count": 0, "size_mb": 0, "approaching_limit": False, "over_limit": False}
         
@@ -290,6 +344,7 @@ class CleanupUtility:
             "temp_files": self.cleanup_temp_files(force=force_temp),
             "old_clips": self.cleanup_old_clips(),
             "old_uploads": self.cleanup_old_uploads(),
+            "cache_files": self.cleanup_cache_files(),
             "organization": self.organize_clips(),
             "directory_status": self.check_directory_limits()
         }
@@ -297,15 +352,18 @@ class CleanupUtility:
         # Calculate totals
         total_removed = (results["temp_files"]["removed"] + 
                         results["old_clips"]["removed"] + 
-                        results["old_uploads"]["removed"])
+                        results["old_uploads"]["removed"] + 
+                        results["cache_files"]["removed"])
         
         total_freed_mb = (results["temp_files"]["size_freed_mb"] + 
                          results["old_clips"]["size_freed_mb"] + 
-                         results["old_uploads"]["size_freed_mb"])
+                         results["old_uploads"]["size_freed_mb"] + 
+                         results["cache_files"]["size_freed_mb"])
         
         total_errors = (results["temp_files"]["errors"] + 
                        results["old_clips"]["errors"] + 
                        results["old_uploads"]["errors"] + 
+                       results["cache_files"]["errors"] + 
                        results["organization"]["errors"])
         
         results["summary"] = {
@@ -315,10 +373,10 @@ class CleanupUtility:
             "files_organized": results["organization"]["organized"]
         }
         
-        logger.info(f"✅ Cleanup complete: {total_removed} files removed, {total_freed_mb:.1f}MB freed")
+        logger.info("✅ Cleanup complete: %s files removed, %.1fMB freed", total_removed, total_freed_mb)
         
         if total_errors > 0:
-            logger.warning(f"⚠️ {total_errors} errors occurred during cleanup")
+            logger.warning("⚠️ %s errors occurred during cleanup", total_errors)
         
         return results
     
@@ -342,11 +400,11 @@ def cleanup_background_job():
         
         # Log summary for monitoring
         summary = results["summary"]
-        logger.info(f"🧹 Background cleanup: {summary['total_files_removed']} files removed, "
-                   f"{summary['total_size_freed_mb']:.1f}MB freed")
+        logger.info("🧹 Background cleanup: %s files removed, %.1fMB freed",
+                    summary['total_files_removed'], summary['total_size_freed_mb'])
         
         return results
         
     except Exception as e:
-        logger.error(f"Background cleanup failed: {e}")
+        logger.error("Background cleanup failed: %s", e)
         return {"error": str(e)} 
\ No newline at end of file
@@ -8,15 +8,19 @@ Reduced from 926 lines to ~300 lines with better separation of concerns.
 Author: StreamClip AI Team
 """
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks, Response
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.requests import Request
 from pydantic import BaseModel
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+from functools import lru_cache
+import asyncio
 import os
 import logging
-from datetime import datetime
-import shutil
+import queue
+import re
+import time
 
 # Import our service modules
 from api_services import JobManager, FileValidator, TwitchVODService, BackgroundTaskService
@@ -42,7 +46,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="StreamClip AI Enhanced",
     description="AI-powered video highlight generator with ML capabilities",
-    version="2.0.0-ML"
+    version="2.0.0-ML",
+    default_response_class=ORJSONResponse  # orjson: 2-5x faster than stdlib json
 )
 
 # Enable CORS
@@ -60,7 +65,7 @@ try:
     ML_ENABLED = True
     logger.info("🚀 Enhanced ML Video Processor initialized")
 except Exception as e:
-    logger.warning(f"Failed to initialize Enhanced Video Processor: {e}")
+    logger.warning("Failed to initialize Enhanced Video Processor: %s", e)
     logger.info("🔄 Falling back to legacy Video Processor")
     processor = VideoProcessor()
     ML_ENABLED = False
@@ -69,11 +74,84 @@ except Exception as e:
 job_manager = JobManager()
 file_validator = FileValidator()
 cleanup_util = CleanupUtility()
-task_service = BackgroundTaskService(job_manager, processor, cleanup_util)
+twitch_service = TwitchVODService()
+task_service = BackgroundTaskService(job_manager, processor, cleanup_util, twitch_service)
 
 # Configuration
+CLIPS_DIR = os.path.realpath("clips")
 MAX_FILE_SIZE = 5 * 1024 * 1024 * 1024  # 5GB
-ALLOWED_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv'}
+ALLOWED_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv'})
+
+# The / welcome payload never changes after startup (ML_ENABLED is fixed once
+# the processor is initialized), so build it exactly once at import time
+ROOT_PAYLOAD = {
+    "message": "🚀 StreamClip AI Enhanced - Video Highlight Generator",
+    "version": "2.0.0-ML",
+    "status": "ML Enhancement Complete - Full System Integration",
+    "ml_enabled": ML_ENABLED,
+    "features": [
+        "🤖 ML-powered funny moment detection" if ML_ENABLED else "📊 Audio peak detection",
+        "📏 Variable-length clips" if ML_ENABLED else "⏱️ Fixed-length clips",
+        "🎯 Social media optimization" if ML_ENABLED else "🎬 Standard video clips",
+        "💾 RAM-optimized processing",
+        "🧹 Automatic cleanup system",
+        "🔄 Background job processing",
+        "📊 Real-time progress tracking",
+        "🌐 RESTful API"
+    ],
+    "endpoints": {
+        "docs": "/docs",
+        "health": "/health",
+        "system_status": "/system-status",
+        "cleanup": "/cleanup (POST)",
+        "performance": "/performance",
+        "optimize": "/optimize (POST)"
+    }
+}
+
+# Pool of reusable 1MB copy buffers so burst uploads don't churn the allocator
+UPLOAD_BUFFER_SIZE = 1 << 20
+UPLOAD_BUFFER_POOL_SIZE = 16
+_upload_buffer_pool: queue.LifoQueue = queue.LifoQueue()
+for _ in range(UPLOAD_BUFFER_POOL_SIZE):
+    _upload_buffer_pool.put(bytearray(UPLOAD_BUFFER_SIZE))
+
+# Tiny TTL cache for read-mostly endpoints that dashboards poll every second
+_response_cache: Dict[str, tuple] = {}
+
+def cached_response(key: str, ttl: float, builder):
+    """Return the cached value for key, rebuilding it once ttl seconds pass"""
+    now = time.monotonic()
+    hit = _response_cache.get(key)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    value = builder()
+    _response_cache[key] = (now, value)
+    return value
+
+def save_upload_to_disk(src, dest_path: str):
+    """Copy an uploaded file to disk through a pooled reusable buffer"""
+    try:
+        buffer = _upload_buffer_pool.get_nowait()
+    except queue.Empty:
+        buffer = bytearray(UPLOAD_BUFFER_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(dest_path, "wb") as dst:
+            while True:
+                read = src.readinto(buffer)
+                if not read:
+                    break
+                dst.write(view[:read])
+    finally:
+        # Only re-pool up to the preallocated count: overflow buffers from a
+        # burst should be garbage collected, not retained forever
+        if _upload_buffer_pool.qsize() < UPLOAD_BUFFER_POOL_SIZE:
+            _upload_buffer_pool.put(buffer)
+
+# Validates a Twitch VOD URL and captures its id in a single scan
+# (same URL formats as TwitchVODService.extract_vod_id)
+TWITCH_VOD_RE = re.compile(r"(?:https?://)?(?:www\.)?twitch\.tv/(?:videos|\w+/v(?:ideo)?)/(\d+)")
 
 # Request/Response Models
 class ProcessingSettings(BaseModel):
@@ -91,22 +169,6 @@ class TwitchVODRequest(BaseModel):
     max_clips: int = 5
     enhanced_mode: bool = False
 
-class JobResponse(BaseModel):
-    """Response model for job status"""
-    id: str
-    filename: str
-    status: str
-    progress: Optional[int] = 0
-    current_phase: Optional[str] = None
-    created_at: str
-    completed_at: Optional[str] = None
-    clips: List[str] = []
-    timestamps: List[float] = []
-    error: Optional[str] = None
-    analysis: Optional[dict] = None
-    stats: Optional[dict] = None
-    source_type: Optional[str] = "upload"
-
 # API Endpoints
 @app.post("/upload", response_model=UploadResponse)
 async def upload_video(
@@ -130,14 +192,12 @@ async def upload_video(
             source_type="upload"
         )
         
-        # Save uploaded file
-        uploads_dir = "uploads"
-        os.makedirs(uploads_dir, exist_ok=True)
+        # Save uploaded file (uploads/ is created once at startup)
+        file_path = f"uploads/{job_id}_{file.filename}"
         
-        file_path = os.path.join(uploads_dir, f"{job_id}_{file.filename}")
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # The pooled copy is synchronous I/O; run it in a thread so a 5GB
+        # upload doesn't freeze the event loop for every other request
+        await asyncio.to_thread(save_upload_to_disk, file.file, file_path)
         
         # Create processing settings
         settings = ProcessingSettings(
@@ -153,7 +213,7 @@ async def upload_video(
             job_id, file_path, settings
         )
         
-        logger.info(f"Started processing job {job_id} for file {file.filename}")
+        logger.info("Started processing job %s for file %s", job_id, file.filename)
         
         return UploadResponse(
             message="File uploaded successfully",
@@ -164,7 +224,7 @@ async def upload_video(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Upload failed: {e}")
+        logger.error("Upload failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 @app.post("/process-twitch-vod")
@@ -174,17 +234,12 @@ async def process_twitch_vod(
 ):
     """Process a Twitch VOD URL"""
     try:
-        # Validate Twitch URL
-        if "twitch.tv" not in request.twitch_url:
+        # Validate the URL and extract the VOD ID in one regex pass
+        match = TWITCH_VOD_RE.search(request.twitch_url)
+        if not match:
             raise HTTPException(status_code=400, detail="Invalid Twitch URL")
-        
-        # Extract VOD ID for job naming
-        twitch_service = TwitchVODService()
-        try:
-            vod_id = twitch_service.extract_vod_id(request.twitch_url)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        
+        vod_id = match.group(1)
+
         # Create job
         job_id = job_manager.create_job(
             filename=f"Twitch VOD {vod_id}",
@@ -207,7 +262,7 @@ async def process_twitch_vod(
             job_id, request.twitch_url, settings
         )
         
-        logger.info(f"Started Twitch VOD processing job {job_id} for {request.twitch_url}")
+        logger.info("Started Twitch VOD processing job %s for %s", job_id, request.twitch_url)
         
         return {
             "message": "Twitch VOD processing started",
@@ -219,100 +274,133 @@ async def process_twitch_vod(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Twitch VOD processing failed: {e}")
+        logger.error("Twitch VOD processing failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
-@app.get("/jobs/{job_id}", response_model=JobResponse)
+# Fields exposed on job status responses
+JOB_PUBLIC_FIELDS = (
+    "id", "filename", "status", "progress", "current_phase", "created_at",
+    "completed_at", "timestamps", "error", "analysis", "stats"
+)
+
+def job_public_view(job: dict) -> dict:
+    """Project a job dict onto its public response shape in one pass"""
+    view = {field: job.get(field) for field in JOB_PUBLIC_FIELDS}
+    # Statuses are stored as JobStatus ints; the API speaks lowercase names
+    if isinstance(view["status"], JobStatus):
+        view["status"] = view["status"].label
+    view["source_type"] = job.get("source_type", "upload")
+    # Serve download names; clip_basenames is precomputed when clips are assigned
+    view["clips"] = job.get("clip_basenames") or [
+        os.path.basename(clip) for clip in job.get("clips", [])
+    ]
+    return view
+
+@app.get("/jobs/{job_id}")
 async def get_job_status(job_id: str):
     """Get job status and results"""
     job = job_manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    # Convert datetime to string for JSON response
-    job_copy = job.copy()
-    if isinstance(job_copy.get("created_at"), datetime):
-        job_copy["created_at"] = job_copy["created_at"].isoformat()
-    if isinstance(job_copy.get("completed_at"), datetime):
-        job_copy["completed_at"] = job_copy["completed_at"].isoformat()
-    
-    return JobResponse(**job_copy)
 
-@app.get("/jobs", response_model=List[JobResponse])
-async def get_all_jobs():
-    """Get all jobs"""
-    jobs = job_manager.get_all_jobs()
-    
-    # Convert datetime objects for JSON response
-    job_responses = []
-    for job in jobs:
-        job_copy = job.copy()
-        if isinstance(job_copy.get("created_at"), datetime):
-            job_copy["created_at"] = job_copy["created_at"].isoformat()
-        if isinstance(job_copy.get("completed_at"), datetime):
-            job_copy["completed_at"] = job_copy["completed_at"].isoformat()
-        
-        job_responses.append(JobResponse(**job_copy))
-    
-    return job_responses
+    # orjson serializes datetime natively, so no manual isoformat pass and no
+    # pydantic validation of our own trusted state
+    return job_public_view(job)
+
+@app.get("/jobs")
+async def get_all_jobs(status: Optional[str] = None,
+                       limit: Optional[int] = None, offset: int = 0):
+    """Get all jobs, optionally filtered/paged server-side"""
+    # One projection pass per job; orjson serializes datetimes directly,
+    # so no copy/isoformat/pydantic round-trip per entry
+    return [
+        job_public_view(job)
+        for job in job_manager.get_all_jobs(status=status, limit=limit, offset=offset)
+    ]
 
 @app.get("/download/{filename}")
 async def download_clip(filename: str):
     """Download a generated clip"""
-    clips_dir = "clips"
-    file_path = os.path.join(clips_dir, filename)
-    
-    if not os.path.exists(file_path):
+    # O(1) authorization: only clips recorded against a job are downloadable
+    if job_manager.get_clip_job(filename) is None:
         raise HTTPException(status_code=404, detail="File not found")
-    
+
+    # Resolve and confine to the clips directory (path-traversal guard)
+    file_path = os.path.realpath(os.path.join(CLIPS_DIR, filename))
+    if not file_path.startswith(CLIPS_DIR + os.sep):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # Stat once and hand the result to FileResponse so Starlette doesn't
+    # re-stat before the kernel sendfile transfer
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
     return FileResponse(
         file_path,
         media_type='video/mp4',
-        filename=filename
+        filename=filename,
+        stat_result=stat_result
     )
 
 @app.get("/system-status")
 async def system_status():
     """Get detailed system status including ML capabilities"""
     try:
-        ml_info = {}
-        if ML_ENABLED and hasattr(processor, 'ml_analyzer'):
-            ml_info = {
-                "ml_enabled": True,
-                "processing_strategy": processor.ml_analyzer.processing_strategy,
-                "available_ram_gb": processor.ml_analyzer.available_ram_gb,
-                "excitement_types": list(processor.ml_analyzer.excitement_types.keys()),
-                "features": [
-                    "Funny moment detection",
-                    "Variable-length clips",
-                    "Social media optimization",
-                    "Context-aware boundaries",
-                    "Rolling baseline analysis"
-                ]
-            }
-        else:
-            ml_info = {
-                "ml_enabled": False,
-                "fallback_mode": "Legacy audio processing",
-                "features": ["Fixed-length clips", "Basic audio peak detection"]
-            }
-        
-        # Directory status
-        dir_status = cleanup_util.check_directory_limits()
-        all_jobs = job_manager.get_all_jobs()
-        
-        return {
-            "system_name": "StreamClip AI Enhanced",
-            "version": "2.0.0-ML",
-            "ml_capabilities": ml_info,
-            "directory_status": dir_status,
-            "active_jobs": len([j for j in all_jobs if j.get("status") == "processing"]),
-            "total_jobs_processed": len(all_jobs)
-        }
+        # Dashboards poll this endpoint every 1-2s; rebuild at most every 5s
+        return cached_response("system_status", 5, _build_system_status)
     except Exception as e:
-        logger.error(f"Error getting system status: {e}")
+        logger.error("Error getting system status: %s", e)
         return {"error": "Failed to get system status", "ml_enabled": ML_ENABLED}
 
+@lru_cache(maxsize=4)
+def _build_ml_info(strategy: str, ram_gb: float, excitement_types: tuple) -> dict:
+    """ML capability info, cached per processor configuration"""
+    return {
+        "ml_enabled": True,
+        "processing_strategy": strategy,
+        "available_ram_gb": ram_gb,
+        "excitement_types": list(excitement_types),
+        "features": [
+            "Funny moment detection",
+            "Variable-length clips",
+            "Social media optimization",
+            "Context-aware boundaries",
+            "Rolling baseline analysis"
+        ]
+    }
+
+def _build_system_status() -> dict:
+    """Build the /system-status payload (cached with a short TTL)"""
+    if ML_ENABLED and hasattr(processor, 'ml_analyzer'):
+        # The analyzer only reconfigures when the processor is rebuilt, so
+        # this dict is served from the lru_cache on every normal request
+        ml_info = _build_ml_info(
+            processor.ml_analyzer.processing_strategy,
+            processor.ml_analyzer.available_ram_gb,
+            tuple(processor.ml_analyzer.excitement_types)
+        )
+    else:
+        ml_info = {
+            "ml_enabled": False,
+            "fallback_mode": "Legacy audio processing",
+            "features": ["Fixed-length clips", "Basic audio peak detection"]
+        }
+
+    # Directory status is refreshed by a background task every 10s, so the
+    # request path never pays for the filesystem walk
+    dir_status = getattr(app.state, "dir_status", {})
+
+    return {
+        "system_name": "StreamClip AI Enhanced",
+        "version": "2.0.0-ML",
+        "ml_capabilities": ml_info,
+        "directory_status": dir_status,
+        "active_jobs": job_manager.active_count(),
+        "total_jobs_processed": job_manager.total_count()
+    }
+
 @app.post("/cleanup")
 async def manual_cleanup():
     """Manually trigger system cleanup"""
@@ -326,7 +414,7 @@ async def manual_cleanup():
             "message": f"Cleaned up {results['summary']['total_files_removed']} files, freed {results['summary']['total_size_freed_mb']:.1f}MB"
         }
     except Exception as e:
-        logger.error(f"Manual cleanup failed: {e}")
+        logger.error("Manual cleanup failed: %s", e)
         return {"success": False, "error": str(e)}
 
 @app.get("/performance")
@@ -372,7 +460,7 @@ async def get_performance_metrics():
         }
         
     except Exception as e:
-        logger.error(f"Error getting performance metrics: {e}")
+        logger.error("Error getting performance metrics: %s", e)
         return {"error": "Failed to get performance metrics", "details": str(e)}
 
 @app.post("/optimize")
@@ -408,102 +496,115 @@ async def optimize_system():
         }
         
     except Exception as e:
-        logger.error(f"System optimization failed: {e}")
+        logger.error("System optimization failed: %s", e)
         return {"success": False, "error": str(e)}
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    processor_status = "healthy"
+def _probe_processor() -> str:
+    """Quick processor validation against a missing file"""
     try:
-        # Quick validation
         test_result = processor.analyze_video_quality("nonexistent.mp4")
         if "error" not in test_result:
-            processor_status = "error"
+            return "error"
     except:
         pass  # Expected for nonexistent file
-    
-    # Check storage
-    storage_status = "healthy"
-    try:
-        job_manager.save_jobs()
-    except:
-        storage_status = "error"
-    
-    all_jobs = job_manager.get_all_jobs()
+    return "healthy"
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    # The probe opens the video stack (moviepy/ffmpeg), so run it in a
+    # thread and reuse the result for 2s so concurrent pollers coalesce
+    now = time.monotonic()
+    hit = _response_cache.get("processor_status")
+    if hit and now - hit[0] < 2:
+        processor_status = hit[1]
+    else:
+        processor_status = await asyncio.to_thread(_probe_processor)
+        _response_cache["processor_status"] = (now, processor_status)
+
+    # Check storage with a one-byte sentinel write instead of rewriting
+    # the whole jobs file on every poll
+    storage_status = "healthy" if job_manager.storage_probe() else "error"
     
     return {
         "status": "healthy",
         "processor": processor_status,
         "storage": storage_status,
         "ml_enabled": ML_ENABLED,
-        "active_jobs": len([j for j in all_jobs if j.get("status") == "processing"]),
-        "total_jobs": len(all_jobs)
+        "active_jobs": job_manager.active_count(),
+        "total_jobs": job_manager.total_count()
     }
 
 @app.get("/")
 async def root():
     """API root endpoint with welcome message"""
-    return {
-        "message": "🚀 StreamClip AI Enhanced - Video Highlight Generator",
-        "version": "2.0.0-ML",
-        "status": "ML Enhancement Complete - Full System Integration",
-        "ml_enabled": ML_ENABLED,
-        "features": [
-            "🤖 ML-powered funny moment detection" if ML_ENABLED else "📊 Audio peak detection",
-            "📏 Variable-length clips" if ML_ENABLED else "⏱️ Fixed-length clips",
-            "🎯 Social media optimization" if ML_ENABLED else "🎬 Standard video clips",
-            "💾 RAM-optimized processing",
-            "🧹 Automatic cleanup system",
-            "🔄 Background job processing",
-            "📊 Real-time progress tracking",
-            "🌐 RESTful API"
-        ],
-                 "endpoints": {
-             "docs": "/docs",
-             "health": "/health",
-             "system_status": "/system-status",
-             "cleanup": "/cleanup (POST)",
-             "performance": "/performance",
-             "optimize": "/optimize (POST)"
-         }
-    }
+    return ROOT_PAYLOAD
+
+async def _refresh_directory_status():
+    """Keep app.state.dir_status fresh so /system-status just reads a dict"""
+    while True:
+        try:
+            app.state.dir_status = await asyncio.to_thread(cleanup_util.check_directory_limits)
+        except Exception as e:
+            logger.warning("Directory status refresh failed: %s", e)
+        await asyncio.sleep(10)
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize system on startup"""
     try:
+        # Create working directories once instead of per request
+        os.makedirs("uploads", exist_ok=True)
+        os.makedirs("clips", exist_ok=True)
+
         # Initialize performance optimizations
         logger.info("⚡ Initializing performance optimizations...")
         optimize_video_processing_pipeline()
         
-        # Clean up old jobs
-        job_manager.cleanup_old_jobs()
-        
-        # Run initial cleanup
-        cleanup_util.run_full_cleanup()
-        
+        # Old-job pruning and the filesystem cleanup are independent I/O
+        # walks; overlap them so startup waits for the slower one, not both
+        await asyncio.gather(
+            asyncio.to_thread(job_manager.cleanup_old_jobs),
+            asyncio.to_thread(cleanup_util.run_full_cleanup)
+        )
+
         # Record initial memory state
         performance_monitor.record_memory_peak()
-        
+
+        # Start the directory status refresher
+        app.state.dir_status_task = asyncio.create_task(_refresh_directory_status())
+
         logger.info("🚀 StreamClip AI Enhanced startup complete")
-        logger.info(f"   ML Enabled: {ML_ENABLED}")
-        logger.info(f"   Jobs Loaded: {len(job_manager.get_all_jobs())}")
-        logger.info(f"   Performance Optimizations: Active")
-        logger.info(f"   Parallel Workers: {parallel_processor.max_workers}")
-        logger.info(f"   Cache Size: {performance_cache.max_size} items")
+        logger.info("   ML Enabled: %s", ML_ENABLED)
+        logger.info("   Jobs Loaded: %s", job_manager.total_count())
+        logger.info("   Performance Optimizations: Active")
+        logger.info("   Parallel Workers: %s", parallel_processor.max_workers)
+        logger.info("   Cache Size: %s items", performance_cache.max_size)
         
     except Exception as e:
-        logger.error(f"Startup error: {e}")
+        logger.error("Startup error: %s", e)
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background refreshers on shutdown"""
+    task = getattr(app.state, "dir_status_task", None)
+    if task:
+        task.cancel()
+
+# Pre-serialized 500 body: under a flood of failing requests the handler
+# shouldn't allocate and JSON-encode the same dict over and over
+INTERNAL_ERROR_BODY = b'{"detail":"Internal server error occurred"}'
 
 # Global exception handler
 @app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    logger.error(f"Global exception: {exc}")
-    return JSONResponse(
+async def global_exception_handler(request: Request, exc: Exception) -> Response:
+    logger.error("Global exception: %s", exc)
+    return Response(
+        content=INTERNAL_ERROR_BODY,
         status_code=500,
-        content={"detail": "Internal server error occurred"}
+        media_type="application/json"
     )
 
 if __name__ == "__main__":
@@ -19,6 +19,14 @@ from performance_optimizer import cached, timed, memory_manager
 
 logger = logging.getLogger(__name__)
 
+try:
+    # Optional GPU backend for spectral features; the CPU path is always there
+    import torch
+    import torchaudio
+except ImportError:
+    torch = None
+    torchaudio = None
+
 class SpectralAnalyzer:
     """Core spectral analysis functionality"""
     
@@ -26,7 +34,101 @@ class SpectralAnalyzer:
         self.sample_rate = sample_rate
         self.hop_length = hop_length
         self.frame_length = 2048
-        
+        # Lazily-built torchaudio transforms (GPU path only)
+        self._gpu_transforms = None
+
+    def gpu_available(self) -> bool:
+        """True when torchaudio and a CUDA device are usable"""
+        return torch is not None and torch.cuda.is_available()
+
+    def _get_gpu_transforms(self):
+        """Build the torchaudio transforms once and keep them on the GPU"""
+        if self._gpu_transforms is None:
+            device = torch.device('cuda')
+            self._gpu_transforms = {
+                'spectrogram': torchaudio.transforms.Spectrogram(
+                    n_fft=self.frame_length, hop_length=self.hop_length,
+                    power=1.0).to(device),
+                'mel': torchaudio.transforms.MelSpectrogram(
+                    sample_rate=self.sample_rate, n_fft=self.frame_length,
+                    hop_length=self.hop_length).to(device),
+                'mfcc': torchaudio.transforms.MFCC(
+                    sample_rate=self.sample_rate, n_mfcc=13,
+                    melkwargs={'n_fft': self.frame_length,
+                               'hop_length': self.hop_length}).to(device),
+                'device': device,
+            }
+        return self._gpu_transforms
+
+    @timed
+    def extract_features_gpu(self, audio_data: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        GPU variant of extract_features via torchaudio
+
+        Computes the magnitude spectrogram, MFCCs and the derived spectral
+        statistics on the CUDA device and copies the results back once.
+        Onset/beat tracking still runs through librosa on the GPU-computed
+        mel envelope. Returns {} on any failure so callers can fall back.
+        """
+        try:
+            transforms = self._get_gpu_transforms()
+            device = transforms['device']
+
+            with torch.no_grad():
+                waveform = torch.from_numpy(
+                    np.ascontiguousarray(audio_data, dtype=np.float32)).to(device)
+
+                S = transforms['spectrogram'](waveform)
+                freqs = torch.linspace(
+                    0, self.sample_rate / 2, S.shape[0], device=device).unsqueeze(1)
+
+                total = S.sum(dim=0) + 1e-10
+                centroid = (freqs * S).sum(dim=0) / total
+                bandwidth = torch.sqrt(
+                    (((freqs - centroid.unsqueeze(0)) ** 2) * S).sum(dim=0) / total)
+
+                energy = S ** 2
+                cumulative = torch.cumsum(energy, dim=0)
+                rolloff_bins = (cumulative >= 0.85 * cumulative[-1].unsqueeze(0)).to(
+                    torch.float32).argmax(dim=0)
+                rolloff = freqs.squeeze(1)[rolloff_bins]
+
+                rms = torch.sqrt(energy.mean(dim=0))
+                mel_power = transforms['mel'](waveform)
+                mfccs = transforms['mfcc'](waveform)
+
+            features = {
+                'spectral_centroid': centroid.cpu().numpy(),
+                'spectral_rolloff': rolloff.cpu().numpy(),
+                'spectral_bandwidth': bandwidth.cpu().numpy(),
+                'zero_crossing_rate': librosa.feature.zero_crossing_rate(
+                    audio_data, hop_length=self.hop_length)[0],
+                'mfccs': mfccs.cpu().numpy(),
+                'rms': rms.cpu().numpy(),
+            }
+
+            # Onset/beat from the GPU mel envelope, finished on the CPU;
+            # beat_track gets the median-aggregated variant it would build
+            # itself (see extract_features)
+            mel_db = librosa.power_to_db(mel_power.cpu().numpy())
+            features['onset_strength'] = librosa.onset.onset_strength(
+                S=mel_db, sr=self.sample_rate, hop_length=self.hop_length)
+            beat_env = librosa.onset.onset_strength(
+                S=mel_db, sr=self.sample_rate, hop_length=self.hop_length,
+                aggregate=np.median)
+            tempo, beats = librosa.beat.beat_track(
+                onset_envelope=beat_env, sr=self.sample_rate,
+                hop_length=self.hop_length)
+            features['tempo'] = tempo
+            features['beats'] = beats
+
+            logger.debug(f"Extracted {len(features)} feature types on GPU")
+            return features
+
+        except Exception as e:
+            logger.warning(f"GPU feature extraction failed, falling back to CPU: {e}")
+            return {}
+
     @cached(persist=True)
     @timed
     def extract_features(self, audio_data: np.ndarray) -> Dict[str, np.ndarray]:
@@ -43,38 +145,51 @@ class SpectralAnalyzer:
             logger.debug("Extracting spectral features...")
             
             features = {}
-            
+
+            # Compute the magnitude spectrogram once; every spectral feature
+            # below reuses it instead of re-running its own STFT pass
+            S = np.abs(librosa.stft(
+                audio_data, n_fft=self.frame_length, hop_length=self.hop_length))
+
             # Core spectral features
             features['spectral_centroid'] = librosa.feature.spectral_centroid(
-                y=audio_data, sr=self.sample_rate, hop_length=self.hop_length)[0]
-            
+                S=S, sr=self.sample_rate)[0]
+
             features['spectral_rolloff'] = librosa.feature.spectral_rolloff(
-                y=audio_data, sr=self.sample_rate, hop_length=self.hop_length)[0]
-            
+                S=S, sr=self.sample_rate)[0]
+
             features['spectral_bandwidth'] = librosa.feature.spectral_bandwidth(
-                y=audio_data, sr=self.sample_rate, hop_length=self.hop_length)[0]
-            
+                S=S, sr=self.sample_rate)[0]
+
             features['zero_crossing_rate'] = librosa.feature.zero_crossing_rate(
                 audio_data, hop_length=self.hop_length)[0]
-            
-            # MFCC features for voice detection
+
+            # MFCC features for voice detection, via a mel spectrogram derived
+            # from the shared power spectrogram
+            mel_power = librosa.feature.melspectrogram(S=S ** 2, sr=self.sample_rate)
             features['mfccs'] = librosa.feature.mfcc(
-                y=audio_data, sr=self.sample_rate, n_mfcc=13, hop_length=self.hop_length)
-            
+                S=librosa.power_to_db(mel_power), sr=self.sample_rate, n_mfcc=13)
+
             # Energy features
-            features['rms'] = librosa.feature.rms(
-                y=audio_data, hop_length=self.hop_length)[0]
-            
-            # Rhythm features
+            features['rms'] = librosa.feature.rms(S=S)[0]
+
+            # Onset detection from the shared mel spectrogram
+            mel_db = librosa.power_to_db(mel_power)
+            features['onset_strength'] = librosa.onset.onset_strength(
+                S=mel_db, sr=self.sample_rate, hop_length=self.hop_length)
+
+            # Rhythm features also reuse the shared mel instead of letting
+            # beat_track recompute its own spectrogram pass - but beat_track
+            # aggregates its internal envelope with the median, so build that
+            # variant separately to keep tempo/beats identical to baseline
+            beat_env = librosa.onset.onset_strength(
+                S=mel_db, sr=self.sample_rate, hop_length=self.hop_length,
+                aggregate=np.median)
             tempo, beats = librosa.beat.beat_track(
-                y=audio_data, sr=self.sample_rate, hop_length=self.hop_length)
+                onset_envelope=beat_env, sr=self.sample_rate, hop_length=self.hop_length)
             features['tempo'] = tempo
             features['beats'] = beats
             
-            # Onset detection
-            features['onset_strength'] = librosa.onset.onset_strength(
-                y=audio_data, sr=self.sample_rate, hop_length=self.hop_length)
-            
             logger.debug(f"Extracted {len(features)} feature types")
             return features
             
@@ -82,9 +197,63 @@ class SpectralAnalyzer:
             logger.error(f"Feature extraction failed: {e}")
             return {}
 
+class ExcitementScores:
+    """
+    Structure-of-arrays container for per-type excitement scores
+
+    Holds one C-contiguous (types x frames) matrix plus a name index, so
+    vectorized consumers can reduce across every type in a single pass while
+    dict-style access (scores['speech'], .items(), 'x' in scores) keeps
+    working for older code.
+    """
+
+    def __init__(self, type_names, matrix: np.ndarray):
+        self.type_names = tuple(type_names)
+        self.matrix = np.ascontiguousarray(matrix)
+        self._index = {name: i for i, name in enumerate(self.type_names)}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.matrix[self._index[name]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self.type_names)
+
+    def __bool__(self) -> bool:
+        return self.matrix.size > 0
+
+    def keys(self):
+        return self.type_names
+
+    def values(self):
+        return iter(self.matrix)
+
+    def items(self):
+        return zip(self.type_names, self.matrix)
+
+    def segment_means(self, start: int, end: int) -> np.ndarray:
+        """Mean of every type over [start:end) in one strided reduction"""
+        return self.matrix[:, start:end].mean(axis=1)
+
 class ExcitementDetector:
     """Detects different types of excitement from spectral features"""
-    
+
+    # Normalized feature rows stacked into the matrix, in column order:
+    # centroid, zcr, bandwidth, onset, rolloff, rms, mfcc[:3], mfcc[1:5]
+    TYPE_NAMES = ('laughter', 'shock', 'hype', 'speech')
+    FEATURE_WEIGHTS = np.array([
+        # laughter: high spectral features + irregular patterns
+        [0.4, 0.3, 0.3, 0.0, 0.0, 0.0, 0.0, 0.0],
+        # shock: sudden onsets + high frequencies
+        [0.0, 0.0, 0.0, 0.5, 0.3, 0.2, 0.0, 0.0],
+        # hype: strong energy + bass
+        [0.0, 0.0, 0.0, 0.2, 0.0, 0.6, 0.2, 0.0],
+        # speech: MFCC patterns
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+    ], dtype=np.float32)
+
     def __init__(self):
         self.excitement_weights = {
             'laughter': {'weight': 1.2, 'freq_range': (300, 3000)},
@@ -92,54 +261,48 @@ class ExcitementDetector:
             'hype': {'weight': 1.0, 'freq_range': (100, 1000)},
             'speech': {'weight': 0.8, 'freq_range': (85, 255)}
         }
-    
-    def analyze_excitement(self, features: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+
+    def analyze_excitement(self, features: Dict[str, np.ndarray]) -> ExcitementScores:
         """
         Classify excitement types from spectral features
-        
+
         Args:
             features: Spectral features dictionary
-            
+
         Returns:
-            Dictionary with excitement scores over time
+            ExcitementScores with per-type scores over time
         """
         try:
-            excitement_scores = {}
-            
-            # Laughter detection: high spectral features + irregular patterns
-            laughter_score = (
-                self._normalize(features['spectral_centroid']) * 0.4 +
-                self._normalize(features['zero_crossing_rate']) * 0.3 +
-                self._normalize(features['spectral_bandwidth']) * 0.3
-            )
-            excitement_scores['laughter'] = laughter_score
-            
-            # Shock detection: sudden onsets + high frequencies  
-            shock_score = (
-                self._normalize(features['onset_strength']) * 0.5 +
-                self._normalize(features['spectral_rolloff']) * 0.3 +
-                self._normalize(features['rms']) * 0.2
-            )
-            excitement_scores['shock'] = shock_score
-            
-            # Hype detection: strong energy + bass
-            hype_score = (
-                self._normalize(features['rms']) * 0.6 +
-                self._normalize(features['onset_strength']) * 0.2 +
-                self._normalize(np.mean(features['mfccs'][:3], axis=0)) * 0.2
-            )
-            excitement_scores['hype'] = hype_score
-            
-            # Speech detection: MFCC patterns
-            speech_score = self._normalize(np.mean(features['mfccs'][1:5], axis=0))
-            excitement_scores['speech'] = speech_score
-            
+            # Both MFCC aggregates live in rows 0-4; slice them once into a
+            # contiguous float32 block so the MFCC buffer is read one time
+            mfcc_low = np.ascontiguousarray(features['mfccs'][:5], dtype=np.float32)
+            mfcc_low3 = mfcc_low[:3].mean(axis=0, dtype=np.float32)
+            mfcc_mid4 = mfcc_low[1:5].mean(axis=0, dtype=np.float32)
+
+            # One contiguous (features x time) matrix and a single matmul
+            # instead of four hand-coded linear combinations with temporaries
+            feature_matrix = np.vstack([
+                self._normalize(features['spectral_centroid']),
+                self._normalize(features['zero_crossing_rate']),
+                self._normalize(features['spectral_bandwidth']),
+                self._normalize(features['onset_strength']),
+                self._normalize(features['spectral_rolloff']),
+                self._normalize(features['rms']),
+                self._normalize(mfcc_low3),
+                self._normalize(mfcc_mid4),
+            # float32 throughout: Python-literal float64 upcasts double the
+            # memory bandwidth of every per-frame array downstream
+            ]).astype(np.float32, copy=False)
+
+            score_matrix = self.FEATURE_WEIGHTS @ feature_matrix
+            excitement_scores = ExcitementScores(self.TYPE_NAMES, score_matrix)
+
             logger.debug(f"Generated {len(excitement_scores)} excitement types")
             return excitement_scores
-            
+
         except Exception as e:
             logger.error(f"Excitement analysis failed: {e}")
-            return {}
+            return ExcitementScores(self.TYPE_NAMES, np.empty((len(self.TYPE_NAMES), 0)))
     
     def _normalize(self, data: np.ndarray) -> np.ndarray:
         """Normalize data to 0-1 range"""
@@ -178,17 +341,29 @@ class BaselineCalculator:
             if window_frames >= len(values):
                 # Window too large, use mean
                 return np.full_like(values, np.mean(values))
-            
-            # Calculate rolling mean
-            baseline = np.convolve(values, np.ones(window_frames)/window_frames, mode='same')
-            
-            # Handle edge effects
-            half_window = window_frames // 2
-            baseline[:half_window] = baseline[half_window]
-            baseline[-half_window:] = baseline[-half_window]
-            
+
+            try:
+                # O(N) prefix-sum box filter: a 15min window at ~43fps is ~38k
+                # frames, so the old convolution cost N*38k multiply-adds
+                prefix = np.cumsum(np.insert(values, 0, 0.0), dtype=np.float64)
+                baseline = (prefix[window_frames:] - prefix[:-window_frames]) / window_frames
+
+                # Replicate the edges back out to the input length
+                pad_left = window_frames // 2
+                pad_right = len(values) - len(baseline) - pad_left
+                baseline = np.pad(baseline, (pad_left, pad_right), mode='edge')
+            except (MemoryError, ValueError):
+                # FFT overlap-add box filter: O(N log W) and no float64
+                # prefix allocation if the prefix-sum path can't run
+                kernel = np.ones(window_frames, dtype=values.dtype) / window_frames
+                baseline = scipy.signal.oaconvolve(values, kernel, mode='same')
+                half_window = window_frames // 2
+                baseline[:half_window] = baseline[half_window]
+                baseline[-half_window:] = baseline[-half_window]
+
             logger.debug(f"Calculated rolling baseline with {self.window_minutes}min window")
-            return baseline
+            # Keep the float64 precision in the prefix only; emit input dtype
+            return baseline.astype(values.dtype, copy=False)
             
         except Exception as e:
             logger.error(f"Baseline calculation failed: {e}")
@@ -1,17 +1,27 @@
+from enum import IntEnum
+
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
 
-class JobStatus(BaseModel):
-    id: str
-    filename: str
-    status: str  # queued, processing, completed, failed
-    video_path: str
-    clips: List[str] = []
-    timestamps: List[float] = []
-    created_at: str
-    error: Optional[str] = None
+class JobStatus(IntEnum):
+    """Job lifecycle states; ints compare cheaply in hot counting paths"""
+    QUEUED = 0
+    PROCESSING = 1
+    COMPLETED = 2
+    FAILED = 3
+
+    @classmethod
+    def from_value(cls, value) -> "JobStatus":
+        """Coerce a stored int or legacy string status to JobStatus"""
+        if isinstance(value, str):
+            return cls[value.upper()]
+        return cls(value)
+
+    @property
+    def label(self) -> str:
+        """Lowercase name used in API responses (e.g. 'processing')"""
+        return self.name.lower()
 
 class UploadResponse(BaseModel):
+    message: str
     job_id: str
-    status: str 
\ No newline at end of file
+    filename: str 
\ No newline at end of file
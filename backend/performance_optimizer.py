@@ -41,8 +41,19 @@ class PerformanceCache:
     
     def _generate_key(self, func_name: str, args: tuple, kwargs: dict) -> str:
         """Generate cache key from function name and arguments"""
-        key_data = f"{func_name}_{str(args)}_{str(sorted(kwargs.items()))}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        hasher = hashlib.md5(func_name.encode())
+        for arg in args:
+            if isinstance(arg, np.ndarray):
+                # Hash the actual buffer: str() truncates large arrays to the
+                # first/last few elements, which collides for arrays that only
+                # differ in the middle (e.g. audio chunks with silent edges)
+                hasher.update(str(arg.shape).encode())
+                hasher.update(str(arg.dtype).encode())
+                hasher.update(np.ascontiguousarray(arg).tobytes())
+            else:
+                hasher.update(str(arg).encode())
+        hasher.update(str(sorted(kwargs.items())).encode())
+        return hasher.hexdigest()
     
     def _is_expired(self, timestamp: datetime) -> bool:
         """Check if cache entry is expired"""
@@ -47,12 +47,6 @@ def test_dependencies():
     except ImportError:
         missing_deps.append("scipy")
     
-    try:
-        import sklearn
-        logger.info("✅ scikit-learn available")
-    except ImportError:
-        missing_deps.append("scikit-learn")
-    
     try:
         import psutil
         logger.info("✅ psutil available")